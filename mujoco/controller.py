@@ -44,6 +44,18 @@ class Controller(ABC):
         '''
         pass
 
+    def set_torques(self, servos: list[int], value: bool):
+        '''
+        Sets the torque of several servos at once.
+        Controllers able to write all the servos in one operation should override this method.
+
+        Parameters:
+        servos (list): The IDs of the servos.
+        value (bool): True to enable torque, False to disable.
+        '''
+        for servo in servos:
+            self.set_torque(servo, value)
+
     @abstractmethod
     def get_torque(self, servo: int) -> bool:
         '''
@@ -98,6 +110,8 @@ class Controller(ABC):
     def set_position(self, servo: int, position: float):
         '''
         Sets the position of the servo.
+        Hardware controllers write the goal position right away, so this interface has no scheduling time;
+        the simulated controller accepts an optional deadline instead (see MuJoCoController.set_position).
 
         Parameters:
         servo (int): The ID of the servo.
@@ -105,6 +119,18 @@ class Controller(ABC):
         '''
         pass
 
+    def set_positions(self, servos: list[int], positions: list[float]):
+        '''
+        Sets the positions of several servos at once.
+        Controllers able to write all the servos in one operation should override this method.
+
+        Parameters:
+        servos (list): The IDs of the servos.
+        positions (list): The positions to set in degrees, one for each servo.
+        '''
+        for servo, position in zip(servos, positions):
+            self.set_position(servo, position)
+
     @abstractmethod
     def get_position(self, servo: int) -> float:
         '''
@@ -118,6 +144,45 @@ class Controller(ABC):
         '''
         pass
 
+    def get_positions(self, servos: list[int]) -> list[float]:
+        '''
+        Gets the current positions of several servos at once.
+        Controllers able to read all the servos in one operation should override this method.
+
+        Parameters:
+        servos (list): The IDs of the servos.
+
+        Returns:
+        list: The current positions in degrees, one for each servo.
+        '''
+        return [self.get_position(servo) for servo in servos]
+
+    def get_velocities(self, servos: list[int]) -> list[float]:
+        '''
+        Gets the current velocities of several servos at once.
+        Controllers able to read all the servos in one operation should override this method.
+
+        Parameters:
+        servos (list): The IDs of the servos.
+
+        Returns:
+        list: The current velocities in RPM, one for each servo.
+        '''
+        return [self.get_velocity(servo) for servo in servos]
+
+    def get_forces(self, servos: list[int]) -> list[float]:
+        '''
+        Gets the current forces of several servos at once.
+        Controllers able to read all the servos in one operation should override this method.
+
+        Parameters:
+        servos (list): The IDs of the servos.
+
+        Returns:
+        list: The current forces in percentage, one for each servo.
+        '''
+        return [self.get_force(servo) for servo in servos]
+
     @abstractmethod
     def get_status(self, servo: int) -> int:
         '''
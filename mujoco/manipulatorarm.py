@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 from enum import Enum
+import numpy as np
 from controller import Controller
 from servo import Servo
 
@@ -32,6 +33,19 @@ class ManipulatorArm(ABC):
 
         self._setup() # setup robot joints
 
+        # joints and servos are fixed after the setup, so they are cached to avoid dict traversals
+        self._joint_order = tuple(self.joints.keys())
+        self._first_servo_per_joint = tuple(servos[0] for servos in self.joints.values())
+        self._first_servo_by_joint = dict(zip(self._joint_order, self._first_servo_per_joint))
+        self._all_servos = tuple(servo for servos in self.joints.values() for servo in servos)
+
+        # servo IDs of each joint, so joint commands can be sent to the controller in a single call
+        self._servo_index_by_joint = {
+            joint: np.array([servo.get_id() for servo in servos], dtype=int) for joint, servos in self.joints.items()
+        }
+        self._all_servo_ids = np.concatenate(list(self._servo_index_by_joint.values()))
+        self._first_servo_ids = np.array([servo.get_id() for servo in self._first_servo_per_joint], dtype=int)
+
         self._set_safe_joints_velocities() # Set safe velocities for all joints
 
     @abstractmethod
@@ -47,9 +61,8 @@ class ManipulatorArm(ABC):
         Sets safe velocities for all joints.
         Iterates through each joint and sets the velocity to a safe value.
         '''
-        for joint in self.joints:
-            for servo in self.joints[joint]:
-                servo.set_velocity(servo.get_safe_velocity())
+        for servo in self._all_servos:
+            servo.set_velocity(servo.get_safe_velocity())
 
     def close(self):
         '''
@@ -73,19 +86,19 @@ class ManipulatorArm(ABC):
         Parameters:
             joint (Joint): The joint to move to its home position.
         '''
-        if joint not in self.joints.keys():
+        servos = self.joints.get(joint)
+        if servos is None:
             raise ValueError('Invalid joint ID')
 
-        for servo in self.joints[joint]:
-            servo.set_position(servo.get_home_position())
+        values = [servo.to_sys_position(servo.get_home_position()) for servo in servos]
+        self.controller.set_positions(self._servo_index_by_joint[joint], values)
 
     def move_joints_to_home(self):
         '''
         Moves all joints to their home (default) positions.
         '''
-        for joint in self.joints:
-            for servo in self.joints[joint]:
-                servo.set_position(servo.get_home_position())
+        values = [servo.to_sys_position(servo.get_home_position()) for servo in self._all_servos]
+        self.controller.set_positions(self._all_servo_ids, values)
 
     def enable_joint_torque(self, joint: Joint):
         '''
@@ -94,19 +107,17 @@ class ManipulatorArm(ABC):
         Parameters:
             joint (Joint): The joint to enable torque for.
         '''
-        if joint not in self.joints.keys():
+        servo_ids = self._servo_index_by_joint.get(joint)
+        if servo_ids is None:
             raise ValueError('Invalid joint ID')
 
-        for servo in self.joints[joint]:
-            servo.set_torque(True)
+        self.controller.set_torques(servo_ids, True)
 
     def enable_joints_torques(self):
         '''
         Enables position control for all servos.
         '''
-        for joint in self.joints:
-            for servo in self.joints[joint]:
-                servo.set_torque(True)
+        self.controller.set_torques(self._all_servo_ids, True)
 
     def disable_joint_torque(self, joint: Joint):
         '''
@@ -115,19 +126,17 @@ class ManipulatorArm(ABC):
         Parameters:
             joint (Joint): The joint to disable torque for.
         '''
-        if joint not in self.joints.keys():
+        servo_ids = self._servo_index_by_joint.get(joint)
+        if servo_ids is None:
             raise ValueError('Invalid joint ID')
 
-        for servo in self.joints[joint]:
-            servo.set_torque(False)
+        self.controller.set_torques(servo_ids, False)
 
     def disable_joints_torques(self):
         '''
         Disables position control for all servos.
         '''
-        for joint in self.joints:
-            for servo in self.joints[joint]:
-                servo.set_torque(False)
+        self.controller.set_torques(self._all_servo_ids, False)
 
     def get_joint_force(self, joint: Joint) -> float:
         '''
@@ -139,24 +148,24 @@ class ManipulatorArm(ABC):
         Returns:
             float: The current force in percentage.
         '''
-        if joint not in self.joints.keys():
+        servo = self._first_servo_by_joint.get(joint)
+        if servo is None:
             raise ValueError('Invalid joint ID')
 
-        servo = self.joints[joint][0]  # first joint servo
         return servo.get_force()
 
-    def get_joints_forces(self) -> list[float]:
+    def get_joints_forces(self) -> np.ndarray:
         '''
         Gets the current forces of all servos in percentage.
 
         Returns:
-            list: A list of current forces in percentage for all joints.
+            np.ndarray: The current forces in percentage for all joints.
         '''
-        forces = [0] * len(self.joints)
-        for index, joint in enumerate(self.joints):
-            servo = self.joints[joint][0] # first joint servo
-            forces[index] = servo.get_force()
-        return forces
+        forces = self.controller.get_forces(self._first_servo_ids)
+        out = np.empty(len(self._first_servo_per_joint))
+        for index, servo in enumerate(self._first_servo_per_joint):
+            out[index] = servo.to_app_force(forces[index])
+        return out
 
     def set_joint_velocity(self, joint: Joint, velocity: float):
         '''
@@ -167,10 +176,11 @@ class ManipulatorArm(ABC):
             joint (Joint): Joint to control (e.g., Shoulder, Elbow).
             velocity (float): Velocity in RPM.
         '''
-        if joint not in self.joints.keys():
+        servos = self.joints.get(joint)
+        if servos is None:
             raise ValueError('Invalid joint ID')
 
-        for servo in self.joints[joint]:
+        for servo in servos:
             servo.set_velocity(velocity)
 
     def set_joints_velocities(self, velocities: list[float]):
@@ -184,9 +194,9 @@ class ManipulatorArm(ABC):
         if len(velocities) != len(self.joints):
             raise ValueError('Number of velocities must match the number of joints.')
 
-        for index, joint in enumerate(self.joints):
+        for joint, velocity in zip(self._joint_order, velocities):
             for servo in self.joints[joint]:
-                servo.set_velocity(velocities[index])
+                servo.set_velocity(velocity)
 
     def get_joint_velocity(self, joint: Joint) -> float:
         '''
@@ -198,24 +208,24 @@ class ManipulatorArm(ABC):
         Returns:
             float: The current velocity in RPM.
         '''
-        if joint not in self.joints.keys():
+        servo = self._first_servo_by_joint.get(joint)
+        if servo is None:
             raise ValueError('Invalid joint ID')
 
-        servo = self.joints[joint][0]  # first joint servo
         return servo.get_velocity()
 
-    def get_joints_velocities(self) -> list[float]:
+    def get_joints_velocities(self) -> np.ndarray:
         '''
         Gets the current velocities of all servos in RPM.
 
         Returns:
-            list: A list of current velocities in RPM for all joints.
+            np.ndarray: The current velocities in RPM for all joints.
         '''
-        velocities = [0] * len(self.joints)
-        for index, joint in enumerate(self.joints):
-            servo = self.joints[joint][0] # first joint servo
-            velocities[index] = servo.get_velocity()
-        return velocities
+        velocities = self.controller.get_velocities(self._first_servo_ids)
+        out = np.empty(len(self._first_servo_per_joint))
+        for index, servo in enumerate(self._first_servo_per_joint):
+            out[index] = servo.to_app_velocity(velocities[index])
+        return out
 
     def set_joint_position(self, joint: Joint, position: float):
         '''
@@ -225,11 +235,12 @@ class ManipulatorArm(ABC):
             joint (Joint): Joint to move.
             position (float): Target position in degrees.
         '''
-        if joint not in self.joints.keys():
+        servos = self.joints.get(joint)
+        if servos is None:
             raise ValueError(f'Invalid joint ID: {joint}')
 
-        for servo in self.joints[joint]:
-            servo.set_position(position)
+        values = [servo.to_sys_position(position) for servo in servos]
+        self.controller.set_positions(self._servo_index_by_joint[joint], values)
 
     def set_joints_positions(self, positions: list[float]):
         '''
@@ -241,9 +252,9 @@ class ManipulatorArm(ABC):
         if len(positions) != len(self.joints):
             raise ValueError('Number of positions must match the number of joints.')
 
-        for index, joint in enumerate(self.joints):
-            for servo in self.joints[joint]:
-                servo.set_position(positions[index])
+        values = [servo.to_sys_position(position)
+                  for joint, position in zip(self._joint_order, positions) for servo in self.joints[joint]]
+        self.controller.set_positions(self._all_servo_ids, values)
 
     def get_joint_position(self, joint: Joint) -> float:
         '''
@@ -255,24 +266,24 @@ class ManipulatorArm(ABC):
         Returns:
             float: The current position of the joint in degrees.
         '''
-        if joint not in self.joints.keys():
+        servo = self._first_servo_by_joint.get(joint)
+        if servo is None:
             raise ValueError(f'Invalid joint ID: {joint}')
 
-        servo = self.joints[joint][0]   # first joint servo
         return servo.get_position()
 
-    def get_joints_positions(self) -> list[float]:
+    def get_joints_positions(self) -> np.ndarray:
         '''
         Gets the current positions of all joints in degrees.
 
         Returns:
-            list: A list of current positions in degrees for all joints.
+            np.ndarray: The current positions in degrees for all joints.
         '''
-        positions = [0] * len(self.joints)
-        for index, joint in enumerate(self.joints):
-            servo = self.joints[joint][0]  # first joint servo
-            positions[index] = servo.get_position()
-        return positions
+        positions = self.controller.get_positions(self._first_servo_ids)
+        out = np.empty(len(self._first_servo_per_joint))
+        for index, servo in enumerate(self._first_servo_per_joint):
+            out[index] = servo.to_app_position(positions[index])
+        return out
 
     def get_joint_position_limits(self, joint: Joint) -> list[float]:
         '''
@@ -284,10 +295,10 @@ class ManipulatorArm(ABC):
         Returns:
             list: A list of position limits for the joint.
         '''
-        if joint not in self.joints.keys():
+        servo = self._first_servo_by_joint.get(joint)
+        if servo is None:
             raise ValueError(f'Invalid joint ID: {joint}')
 
-        servo = self.joints[joint][0]   # first joint servo
         return servo.get_position_limits()
 
     def get_joint_velocity_limits(self, joint: Joint) -> list[float]:
@@ -300,8 +311,8 @@ class ManipulatorArm(ABC):
         Returns:
             list: A list of velocity limits for the joint.
         '''
-        if joint not in self.joints.keys():
+        servo = self._first_servo_by_joint.get(joint)
+        if servo is None:
             raise ValueError(f'Invalid joint ID: {joint}')
 
-        servo = self.joints[joint][0]   # first joint servo
         return servo.get_velocity_limits()
@@ -1,21 +1,159 @@
+import bisect
+from collections import deque
+import ctypes
+import itertools
 import mujoco
 import mujoco.viewer
 import numpy as np
 import os
+import sys
 import time
 import threading
 
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional, a kernel specialized for the model is generated instead
+    njit = None
+
+# periodic timer of the simulation thread: a Linux timerfd, through the os module (Python 3.13+) or libc
+if hasattr(os, 'timerfd_create'):
+    def _timerfd_create() -> int:
+        return os.timerfd_create(time.CLOCK_MONOTONIC)
+
+    def _timerfd_settime(fd: int, period: float):
+        os.timerfd_settime(fd, initial=period, interval=period)
+elif sys.platform.startswith('linux'):
+    _libc = ctypes.CDLL(None, use_errno=True)
+
+    class _timespec(ctypes.Structure):
+        _fields_ = [('tv_sec', ctypes.c_long), ('tv_nsec', ctypes.c_long)]
+
+    class _itimerspec(ctypes.Structure):
+        _fields_ = [('it_interval', _timespec), ('it_value', _timespec)]
+
+    def _timerfd_create() -> int:
+        fd = _libc.timerfd_create(time.CLOCK_MONOTONIC, 0)
+        if fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        return fd
+
+    def _timerfd_settime(fd: int, period: float):
+        spec = _timespec(*divmod(round(period * 1e9), 1000000000))
+        if _libc.timerfd_settime(fd, 0, ctypes.byref(_itimerspec(spec, spec)), None) < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+else:
+    _timerfd_create = None
+    _timerfd_settime = None
+
+def _servo_step(qpos, tpos, max_step):
+    '''
+    Control law of a servo: moves from the current position towards the target, at most max_step.
+    The kernel generated by _specialize_step_kernel inlines the same law.
+
+    Parameters:
+      qpos (float): Current position.
+      tpos (float): Target position.
+      max_step (float): Maximum displacement in one step.
+
+    Returns:
+      float: The new position.
+    '''
+    diff = tpos - qpos
+    if diff > max_step:
+        diff = max_step
+    elif diff < -max_step:
+        diff = -max_step
+    return qpos + diff
+
+if njit is not None:
+    _servo_step_jit = njit(inline='always')(_servo_step)
+
+    def _step_kernel_body(qpos, ctrl, tpos, tvel, mask, dt, nu):
+        '''
+        Moves the controls of the enabled servos towards their targets, limited by the servo velocities.
+        It is compiled twice: serial (_step_kernel) and multithreaded without the GIL (_step_kernel_par),
+        where prange splits the servos among the cores. prange behaves as range in the serial version.
+
+        Parameters:
+          qpos (np.ndarray): Current joint positions.
+          ctrl (np.ndarray): Controls to update.
+          tpos (np.ndarray): Target positions.
+          tvel (np.ndarray): Target velocities.
+          mask (np.ndarray): Position control status of each servo.
+          dt (float): Time elapsed between steps.
+          nu (int): Number of servos.
+        '''
+        for i in prange(nu):
+            if mask[i]:
+                ctrl[i] = _servo_step_jit(qpos[i], tpos[i], tvel[i] * dt) # new position
+
+    _step_kernel = njit(cache=True, fastmath=True)(_step_kernel_body)
+    # not cached: the cache is indexed by function and signature, it would be shared with the serial version
+    # the parallel version only pays off for many servos (see MuJoCoController.PARALLEL_MIN_SERVOS)
+    _step_kernel_par = njit(fastmath=True, parallel=True, nogil=True)(_step_kernel_body)
+
+    # numba's default threading layer (workqueue) must not be entered by several threads at once,
+    # which happens with several controllers, each stepping in its own simulation thread
+    _step_kernel_par_lock = threading.Lock()
+
+    def _step_kernel_par_locked(qpos, ctrl, tpos, tvel, mask, dt, nu):
+        '''
+        Runs _step_kernel_par, one simulation thread at a time.
+        '''
+        with _step_kernel_par_lock:
+            _step_kernel_par(qpos, ctrl, tpos, tvel, mask, dt, nu)
+else:
+    _step_kernel = None
+    _step_kernel_par = None
+    _step_kernel_par_locked = None
+
+def _specialize_step_kernel(nu: int):
+    '''
+    Generates a pure Python version of _step_kernel for a fixed number of servos, with the loop unrolled
+    into straight-line code and the servo control law (see _servo_step) inlined, so no function is called
+    per servo. It is used when numba is not available.
+
+    Parameters:
+      nu (int): Number of servos.
+
+    Returns:
+      callable: The step kernel, with the same signature as _step_kernel.
+    '''
+    src = 'def _step_kernel_nu(qpos, ctrl, tpos, tvel, mask, dt, nu):\n'
+    for i in range(nu):
+        src += (f'    if mask[{i}]:\n'
+                f'        max_step = tvel[{i}] * dt\n'
+                f'        diff = tpos[{i}] - qpos[{i}]\n'
+                f'        ctrl[{i}] = qpos[{i}] + (max_step if diff > max_step else -max_step if diff < -max_step else diff)\n')
+    src += '    pass\n'
+    namespace = {}
+    exec(compile(src, f'<step kernel nu={nu}>', 'exec'), namespace)
+    return namespace['_step_kernel_nu']
+
 class MuJoCoController:
-    def __init__(self, robot_name: str='reactorx200', show_viewer: bool=True):
+    VELOCITY_MIN = np.pi/30     # rad/s, mapped to the longest sampling period
+    VELOCITY_MAX = 61*np.pi/30  # rad/s, mapped to the shortest sampling period
+    SAMPLE_DT_MIN = 0.002       # sec
+    SAMPLE_DT_MAX = 0.02        # sec
+    PARALLEL_MIN_SERVOS = 16    # servos needed to run the step kernel on several cores
+    MAX_WAYPOINTS = 64          # pending waypoints kept for each servo
+
+    def __init__(self, robot_name: str='reactorx200', show_viewer: bool=True, realtime: bool=False,
+                 latency_budget: float=0.0):
         '''
         Initializes a MuJoCoController instance.
 
         Parameters:
         robot_name (str): The name of the robot model.
         show_viewer (bool): Whether to show the viewer or not.
+        realtime (bool): Whether to run the simulation thread with real-time priority on its own core (at least 2 cores are needed).
+        latency_budget (float): Simulation time (s) between an untimed position command and its deadline.
         '''
         self.robot_name = robot_name
         self.show_viewer = show_viewer
+        self.realtime = realtime
 
         # mujoco_path = os.getenv('MUJOCO_PATH')
         mujoco_path = '.' # debugging
@@ -40,97 +178,300 @@ class MuJoCoController:
             # Load keyframe in the model state
             mujoco.mj_resetDataKeyframe(self.model, self.data, keyframe_id)
 
+            # keep the home state, so the robot can be reset without reloading the keyframe
+            self._home_qpos = self.data.qpos.copy()
+            self._home_qvel = self.data.qvel.copy()
+            self._home_ctrl = self.data.ctrl.copy()
+
         except Exception as e:
             print(f'Initialization error: {str(e)}')
             raise
 
-        self.lock = threading.RLock()
         self.running = threading.Event()
+        self._stop_evt = threading.Event() # wakes up the viewer as soon as the controller is closed
         self.simul_thread = threading.Thread(target=self._simul_loop, name='Simulation Thread')
-        self.viewer_thread = threading.Thread(target=self._viewer_loop, name='Viewer Thread')
 
         self.update_time = 0.2 # sec
-        self.timestep = 0.002
-
-        self.torque_enabled = [False] * self.model.nu # torque/force status
-        self.target_velocity = [0] * self.model.nu # target velocities for each joint
-        self.target_position = [0] * self.model.nu # target positions for each joint
+        # wall-clock sampling period of the servos, it depends on the servo velocity (see set_velocity),
+        # while the simulation always advances model.opt.timestep per step
+        self._sample_dt = self.SAMPLE_DT_MIN
+        self._sample_dt_slope = (self.SAMPLE_DT_MAX - self.SAMPLE_DT_MIN) / (self.VELOCITY_MAX - self.VELOCITY_MIN)
+        self.max_missed_steps = 10 # steps run at most to catch up after a late wakeup
+        self.realtime_priority = 80 # SCHED_FIFO priority of the simulation thread
+        self.realtime_cpu = None # core reserved for the simulation thread
+        if self.realtime:
+            cpus = os.sched_getaffinity(0) if hasattr(os, 'sched_getaffinity') else set()
+            if len(cpus) >= 2: # one is left for the viewer and the application
+                self.realtime_cpu = max(cpus) # last available core
+            else:
+                print(f'Real-time scheduling needs at least 2 cores ({len(cpus)} available), '
+                      'the simulation runs with normal priority')
+                self.realtime = False
+        self._realtime_ready = threading.Event() # set once the simulation thread has applied (or not) it
+
+        self.torque_enabled = np.zeros(self.model.nu, dtype=bool) # torque/force status
+        self.target_velocity = np.zeros(self.model.nu) # target velocities for each joint
+
+        self.target_position = np.zeros(self.model.nu) # target positions for each joint (simulation side)
+
+        # setters queue position commands (deadline, sequence, position) for each servo in bounded deques,
+        # which the simulation thread moves to its waypoint lists sorted by deadline; the sequence number
+        # keeps the commands with the same deadline in arrival order (deque appends/pops and itertools.count
+        # are thread safe, no locks involved)
+        self.latency_budget = latency_budget # sec of simulation time between a position command and its deadline
+        self.target_queue = [deque(maxlen=self.MAX_WAYPOINTS) for _ in range(self.model.nu)]
+        self._command_seq = itertools.count()
+        self._waypoints = [[] for _ in range(self.model.nu)] # pending (deadline, sequence, position) of each servo
+        self._last_waypoint = [None] * self.model.nu # last waypoint reached by each servo
+        self._target_seq = [-1] * self.model.nu # sequence number of the last waypoint reached by each servo
+
+        # sequence counter of the simulation data (seqlock): odd while the simulation thread is stepping,
+        # readers retry when it changes during their read instead of blocking the simulation
+        self._seq = 0
+        self._home_requested = threading.Event() # reset to the home state on the next step
+        self._home_seq = -1 # sequence number of the last reset request, older commands are dropped
+
+        # joint axes and torque/force sensor offsets of each servo are static, so they are computed once
+        joints = self.model.actuator_trnid[:, 0]
+        self._force_axis = np.asarray([self.model.jnt_axis[joint] for joint in joints]) # [1 0 0], [0 1 0] or [0 0 1]
+        self._force_start = np.asarray([joint*3 for joint in joints]) # [torque X, torque Y, torque Z] offset
+        self._force_index = self._force_start[:, np.newaxis] + np.arange(3) # sensor indices of each servo
+
+        # step kernel for this model: compiled by numba if available, otherwise generated for its servos
+        if njit is not None:
+            self._step_kernel = _step_kernel_par_locked if self.model.nu >= self.PARALLEL_MIN_SERVOS else _step_kernel
+            # compile the kernel now, so the first simulation step does not pay for it
+            self._step_kernel(np.zeros(self.model.nu), np.zeros(self.model.nu), np.zeros(self.model.nu),
+                              np.zeros(self.model.nu), np.zeros(self.model.nu, dtype=bool), self._sample_dt, self.model.nu)
+        else:
+            self._step_kernel = _specialize_step_kernel(self.model.nu)
 
         self._start()
 
     def _start(self):
         '''
-        Starts the simulation/visualization in separate threads.
+        Starts the simulation in a separate thread.
+        The viewer is not started here, it runs on the caller's thread (see spin_viewer).
         '''
         if not self.running.is_set():
             self.running.set() # lets work
             self.simul_thread.start()
-            self.viewer_thread.start()
 
+    def _update_targets(self):
+        '''
+        Moves the queued position commands to the waypoints of each servo, consumes the waypoints whose
+        deadline has been reached and interpolates linearly the target positions towards the next waypoint.
+        A pending home reset (see reset_home) is applied first.
+        All the commands are inserted in deadline order (untimed ones are due after the latency budget),
+        and in arrival order among commands with the same deadline, so the latest one wins.
+        '''
+        if self._home_requested.is_set():
+            self._reset_home()
+
+        now = self.data.time
+        tp = self.target_position
+        last_waypoint = self._last_waypoint
+        target_seq = self._target_seq
+        for servo, (queue, waypoints) in enumerate(zip(self.target_queue, self._waypoints)):
+            while queue:
+                try:
+                    command = queue.popleft()
+                except IndexError: # cleared meanwhile by reset_home
+                    break
+                bisect.insort(waypoints, command)
+                del waypoints[self.MAX_WAYPOINTS:] # drop the farthest ones
+            if not waypoints:
+                continue
+
+            if last_waypoint[servo] is None: # first waypoint after an idle period
+                last_waypoint[servo] = (now, -1, tp[servo])
+            due = bisect.bisect_right(waypoints, (now, float('inf')))
+            if due:
+                last_waypoint[servo] = waypoints[due - 1]
+                target_seq[servo] = last_waypoint[servo][1]
+                del waypoints[:due]
+
+            t0, _, q0 = last_waypoint[servo]
+            if waypoints:
+                t1, _, q1 = waypoints[0]
+                tp[servo] = q0 + (q1 - q0) * (now - t0) / (t1 - t0)
+            else:
+                tp[servo] = q0
+                last_waypoint[servo] = None
 
     def _step(self):
         '''
         Advances the simulation by one step.
         '''
-        with self.lock:
-            for servo in range(self.model.nu):
-                if self.torque_enabled[servo]:
-                    current_pos = self.data.qpos[servo]
-                    max_step = self.target_velocity[servo] * self.timestep
+        # local names for the attributes used in this hot path
+        model = self.model
+        data = self.data
+        nu = model.nu
+        dt = self._sample_dt
+        tp = self.target_position
+        tv = self.target_velocity
+        mask = self.torque_enabled
+        kernel = self._step_kernel
+
+        self._seq += 1 # odd: step in progress
+        try:
+            self._update_targets()
+
+            kernel(data.qpos, data.ctrl, tp, tv, mask, dt, nu)
+
+            mujoco.mj_step(model, data)  # Advance the simulation
+        finally:
+            self._seq += 1 # even: data consistent (also if the step failed)
+
+    def _reset_home(self):
+        '''
+        Restores the home state saved after loading the keyframe and drops the waypoints of the commands
+        sent before the reset request. It runs in the simulation thread (see reset_home).
+        '''
+        np.copyto(self.data.qpos, self._home_qpos)
+        np.copyto(self.data.qvel, self._home_qvel)
+        np.copyto(self.data.ctrl, self._home_ctrl)
+        # commands sent after the request may have been moved to the waypoints (or even reached) since,
+        # so they are kept along with the targets they set
+        home_seq = self._home_seq
+        for servo, waypoints in enumerate(self._waypoints):
+            waypoints[:] = [waypoint for waypoint in waypoints if waypoint[1] > home_seq]
+            if self._target_seq[servo] <= home_seq:
+                self.target_position[servo] = self._home_ctrl[servo]
+                self._last_waypoint[servo] = None
+        self._home_requested.clear()
+
+    def reset_home(self):
+        '''
+        Resets the robot to its home state (keyframe "home") without moving the servos.
+        The queued position commands are dropped here, while those sent after this call are kept.
+        While the simulation runs, the reset is deferred: the simulation thread applies it on its next step,
+        so positions read right after this call may still be the previous ones. Once the controller is
+        closed, the reset is applied directly.
+        '''
+        self._home_seq = next(self._command_seq)
+        for queue in self.target_queue:
+            queue.clear()
+        if self.running.is_set():
+            self._home_requested.set()
+        else:
+            self.simul_thread.join() # no step can be in progress
+            self._reset_home()
 
-                    diff = self.target_position[servo] - current_pos
-                    step = np.clip(diff, -max_step, max_step)
+    def _read(self, read):
+        '''
+        Reads the simulation data consistently, retrying the read whenever the simulation thread
+        stepped meanwhile (seqlock reader). Once the simulation thread has ended, the data is read as is.
 
-                    self.data.ctrl[servo] = current_pos + step # new position
+        Parameters:
+          read (callable): Function returning a copy of the values to read.
 
-            mujoco.mj_step(self.model, self.data)  # Advance the simulation
+        Returns:
+          The values returned by the read function.
+        '''
+        while True:
+            seq = self._seq
+            alive = self.simul_thread.is_alive()
+            if seq & 1 and alive: # step in progress, let the simulation thread finish it
+                time.sleep(0)
+                continue
+            value = read()
+            if self._seq == seq or not alive:
+                return value
+
+    def _ticks(self):
+        '''
+        Waits for the simulation periods, yielding the number of periods elapsed since the previous one.
+        On Linux, a timerfd is used, which is rearmed whenever the sampling period changes; on other
+        platforms, it sleeps until absolute monotonic deadlines.
+        '''
+        if _timerfd_create is not None:
+            fd = _timerfd_create()
+            try:
+                period = 0
+                while self.running.is_set():
+                    if period != self._sample_dt:
+                        period = self._sample_dt
+                        _timerfd_settime(fd, period)
+                    yield int.from_bytes(os.read(fd, 8), sys.byteorder) # blocks until the next tick
+            finally:
+                os.close(fd)
+        else:
+            period = self._sample_dt
+            deadline = time.monotonic() + period
+            while self.running.is_set():
+                time.sleep(max(0, deadline - time.monotonic()))
+                elapsed = 1 + int((time.monotonic() - deadline) // period)
+                deadline += (elapsed - 1) * period # last deadline reached
+                period = self._sample_dt
+                deadline += period
+                yield elapsed
+
+    def _apply_realtime(self):
+        '''
+        Gives the calling thread (the simulation thread) real-time FIFO priority and then pins it to the
+        reserved core. Platforms or users lacking support/permissions keep running with normal priority
+        on any core (no core is reserved).
+        '''
+        try:
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(self.realtime_priority))
+            os.sched_setaffinity(0, {self.realtime_cpu})
+        except (AttributeError, OSError, TypeError) as e:
+            self.realtime_cpu = None
+            print(f'Real-time scheduling not available for the simulation: {str(e)}')
+        finally:
+            self._realtime_ready.set()
 
     def _simul_loop(self):
         '''
         Main simulation loop.
         '''
-        last_time = time.perf_counter()
-        while self.running.is_set():
-            current_time = time.perf_counter()
-            elapsed_time = current_time - last_time
+        if self.realtime:
+            self._apply_realtime()
 
-            if elapsed_time >= self.timestep:
-                self._step()
-                last_time = current_time
-            else:
-                time.sleep(max(0, min(self.timestep/10, self.timestep - elapsed_time)))
+        step = self._step
+        max_missed_steps = self.max_missed_steps
+        for elapsed in self._ticks():
+            for _ in range(min(elapsed, max_missed_steps)): # catch up the missed ticks
+                step()
 
-    def _viewer_loop(self):
+    def spin_viewer(self):
         '''
-        Main viewer loop.
+        Runs the viewer until the controller is closed or the viewer window is closed.
+        It must be called from the main thread, which blocks here while the simulation runs in its own thread.
+        Without viewer, it just waits for the controller to be closed.
         '''
-        if self.show_viewer:
-            viewer = mujoco.viewer.launch_passive(self.model, self.data)
-            last_time = time.perf_counter()
-            while self.running.is_set() and viewer.is_running():
-                current_time = time.perf_counter()
-                elapsed_time = current_time - last_time
+        if self.realtime:
+            self._realtime_ready.wait()
+        if self.realtime_cpu is not None:
+            # keep the viewer away from the core of the simulation thread
+            cpus = os.sched_getaffinity(0) - {self.realtime_cpu}
+            if cpus:
+                os.sched_setaffinity(0, cpus)
 
-                if elapsed_time >= self.update_time:
-                    viewer.sync()
-                    last_time = current_time
-                else:
-                    time.sleep(max(0, min(self.update_time/10, self.update_time - elapsed_time)))  # Short sleep for better responsiveness
+        if not self.show_viewer:
+            self._stop_evt.wait()
+            return
+
+        viewer = mujoco.viewer.launch_passive(self.model, self.data)
+        try:
+            while viewer.is_running():
+                if self._stop_evt.wait(self.update_time): # closed
+                    break
+                viewer.sync()
+        finally:
+            viewer.close()
 
     def close(self):
         '''
-        Safely kills the threads and disables the joints torque.
+        Safely kills the simulation thread (which also ends the viewer) and disables the joints torque.
         '''
         if self.running.is_set():
             self.running.clear()
-            # Wait a while and kill the threads
-            time.sleep(0.1)
+            self._stop_evt.set()
             if self.simul_thread and self.simul_thread.is_alive():
                 self.simul_thread.join(timeout=1.0)
 
-            if self.viewer_thread and self.viewer_thread.is_alive():
-                self.viewer_thread.join(timeout=1.0)
-
     def factory(self, servo: int):
         '''
         Performs a factory reset on the specified servo.
@@ -138,8 +479,7 @@ class MuJoCoController:
         Parameters:
           servo (int): The ID of the servo to reset.
         '''
-        with self.lock:
-            self.torque_enabled[servo] = False
+        self.torque_enabled[servo] = False
 
     def reboot(self, servo: int):
         '''
@@ -148,8 +488,7 @@ class MuJoCoController:
         Parameters:
           servo (int): The ID of the servo to reboot.
         '''
-        with self.lock:
-            self.torque_enabled[servo] = False
+        self.torque_enabled[servo] = False
 
     def set_torque(self, servo: int, value: bool):
         '''
@@ -159,8 +498,17 @@ class MuJoCoController:
           servo (int): The ID of the servo.
           value (bool): True to enable torque, False to disable.
         '''
-        with self.lock:
-            self.torque_enabled[servo] = value
+        self.torque_enabled[servo] = value
+
+    def set_torques(self, servos: np.ndarray, value: bool):
+        '''
+        Enables/disables the position control of several servos at once with a single mask update.
+
+        Parameters:
+          servos (np.ndarray): The IDs of the servos.
+          value (bool): True to enable torque, False to disable.
+        '''
+        self.torque_enabled[servos] = value
 
     def get_torque(self, servo: int) -> bool:
         '''
@@ -172,8 +520,7 @@ class MuJoCoController:
         Returns:
           bool: True if torque is enabled, False otherwise.
         '''
-        with self.lock:
-            return self.torque_enabled[servo]
+        return bool(self.torque_enabled[servo])
 
     def get_force(self, servo: int) -> float:
         '''
@@ -185,13 +532,26 @@ class MuJoCoController:
         Returns:
           float: The torque/force in torque units (N/m or N).
         '''
-        with self.lock:
-            if not self.torque_enabled[servo]:
-                raise Exception(f'Attempt to get torque percent with the position control disabled for servo {servo}')
-            joint = self.model.actuator_trnid[servo, 0] 
-            axes = self.model.jnt_axis[joint]                 # [1 0 0], [0 1 0] or [0 0 1]
-            torques = self.data.sensordata[joint*3:joint*3+3] # [torque X, torque Y, torque Z]
-            return np.dot(axes, torques)
+        if not self.torque_enabled[servo]:
+            raise Exception(f'Attempt to get torque percent with the position control disabled for servo {servo}')
+        start = self._force_start[servo]
+        return self._read(lambda: float(self._force_axis[servo] @ self.data.sensordata[start:start+3]))
+
+    def get_forces(self, servos: np.ndarray) -> np.ndarray:
+        '''
+        Gets the torques/forces of several servos at once in torque units (N/m or N).
+
+        Parameters:
+          servos (np.ndarray): The IDs of the servos.
+
+        Returns:
+          np.ndarray: The torques/forces in torque units (N/m or N), one for each servo.
+        '''
+        if not self.torque_enabled[servos].all():
+            disabled = [int(servo) for servo in servos if not self.torque_enabled[servo]]
+            raise Exception(f'Attempt to get torque percent with the position control disabled for servos {disabled}')
+        torques = self._read(lambda: self.data.sensordata[self._force_index[servos]])
+        return np.einsum('ij,ij->i', self._force_axis[servos], torques)
 
     def set_velocity(self, servo: int, velocity: float):
         '''
@@ -201,12 +561,12 @@ class MuJoCoController:
           servo (int): The ID of the servo.
           velocity (float): The velocity in velocity units (rad/s).
         '''
-        with self.lock:
-            if self.torque_enabled[servo]:
-                raise Exception(f'Attempt to set velocity with torque enabled for servo {servo}.')
-            # adjust the timestep according to servo velocity
-            self.timestep = round(np.interp(velocity, [np.pi/30, 61*np.pi/30], [0.02, 0.002]), 3)
-            self.target_velocity[servo] = velocity
+        if self.torque_enabled[servo]:
+            raise Exception(f'Attempt to set velocity with torque enabled for servo {servo}.')
+        # adjust the sampling period according to servo velocity (linear map, clipped to the period range)
+        sample_dt = self.SAMPLE_DT_MAX - (float(velocity) - self.VELOCITY_MIN) * self._sample_dt_slope
+        self._sample_dt = round(min(max(sample_dt, self.SAMPLE_DT_MIN), self.SAMPLE_DT_MAX), 3)
+        self.target_velocity[servo] = velocity
 
     def get_velocity(self, servo: int) -> float:
         '''
@@ -218,21 +578,52 @@ class MuJoCoController:
         Returns:
           float: The velocity in velocity units (rad/s).
         '''
-        with self.lock:
-            return self.target_velocity[servo]
+        return self.target_velocity[servo]
 
-    def set_position(self, servo: int, position: float):
+    def get_velocities(self, servos: np.ndarray) -> np.ndarray:
+        '''
+        Gets the velocities of several servos at once in velocity units (rad/s).
+
+        Parameters:
+          servos (np.ndarray): The IDs of the servos.
+
+        Returns:
+          np.ndarray: The velocities in velocity units (rad/s), one for each servo.
+        '''
+        return self.target_velocity[servos]
+
+    def set_position(self, servo: int, position: float, when: float=None):
         '''
         Sets the position of a servo in position units (rad).
+        The position is queued as a waypoint, which the servo follows in deadline order.
 
         Parameters:
           servo (int): The ID of the servo.
           position (float): The position in position units (rad).
+          when (float): Simulation time (s) at which the position must be the target of the servo.
+                        By default, the current simulation time plus the latency budget.
+        '''
+        if not self.torque_enabled[servo]:
+            raise Exception(f'Attempt to set position with torque disabled for servo {servo}')
+        deadline = self.data.time + self.latency_budget if when is None else when
+        self.target_queue[servo].append((deadline, next(self._command_seq), position))
+
+    def set_positions(self, servos: np.ndarray, positions: np.ndarray, when: float=None):
         '''
-        with self.lock:
-            if not self.torque_enabled[servo]:
-                raise Exception(f'Attempt to set position with torque disabled for servo {servo}')
-            self.target_position[servo] = position
+        Sets the positions of several servos at once in position units (rad).
+
+        Parameters:
+          servos (np.ndarray): The IDs of the servos.
+          positions (np.ndarray): The positions in position units (rad), one for each servo.
+          when (float): Simulation time (s) at which the positions must be the targets of the servos.
+                        By default, the current simulation time plus the latency budget.
+        '''
+        if not self.torque_enabled[servos].all():
+            disabled = [int(servo) for servo in servos if not self.torque_enabled[servo]]
+            raise Exception(f'Attempt to set position with torque disabled for servos {disabled}')
+        deadline = self.data.time + self.latency_budget if when is None else when
+        for servo, position in zip(servos, positions):
+            self.target_queue[servo].append((deadline, next(self._command_seq), position))
 
     def get_position(self, servo: int) -> float:
         '''
@@ -244,8 +635,19 @@ class MuJoCoController:
         Returns:
           float: The position in position units (rad).
         '''
-        with self.lock:
-            return self.data.qpos[servo]
+        return self._read(lambda: self.data.qpos[servo])
+
+    def get_positions(self, servos: np.ndarray) -> np.ndarray:
+        '''
+        Gets the positions of several servos at once in position units (rad).
+
+        Parameters:
+          servos (np.ndarray): The IDs of the servos.
+
+        Returns:
+          np.ndarray: The positions in position units (rad), one for each servo.
+        '''
+        return self._read(lambda: self.data.qpos[servos])
 
     def get_status(self, servo: int) -> int:
         '''
@@ -257,9 +659,8 @@ class MuJoCoController:
         Returns:
           int: The hardware error status of the servo.
         '''
-        with self.lock:
-            status = 0 # it needs to be defined
-            return status
+        status = 0 # it needs to be defined
+        return status
 
     def get_moving_status(self, servo: int) -> int:
         '''
@@ -271,6 +672,5 @@ class MuJoCoController:
         Returns:
           int: The moving status of the servo.
         '''
-        with self.lock:
-            status = 0 # it needs to be defined
-            return status
+        status = 0 # it needs to be defined
+        return status
@@ -1,4 +1,5 @@
 import numpy as np
+import threading
 import time
 
 from manipulatorarm import ManipulatorArm, Joint
@@ -9,7 +10,18 @@ class MuJoCoReactorX200(ManipulatorArm):
     '''
     Main class for the ReactorX200 robot simulator.
     '''
-    def __init__(self, device_name: str='reactorx200'):
+    def __init__(self, device_name: str='reactorx200', realtime: bool=False, latency_budget: float=0.0):
+        '''
+        Initializes the simulated ReactorX 200.
+
+        Parameters:
+            device_name (str): The name of the robot model.
+            realtime (bool): Whether to run the simulation thread with real-time priority on its own core.
+            latency_budget (float): Simulation time (s) the joints take to reach each commanded position,
+                                    interpolating between consecutive commands (0 to jump to it on the next step).
+        '''
+        self.realtime = realtime
+        self.latency_budget = latency_budget
         super().__init__(device_name)
 
     def _setup(self):
@@ -130,7 +142,8 @@ class MuJoCoReactorX200(ManipulatorArm):
                     position_limits=[-20, 50]  # a more conservative range
                 )
 
-        self.controller = MuJoCoController(self.device_name)
+        self.controller = MuJoCoController(self.device_name, realtime=self.realtime,
+                                           latency_budget=self.latency_budget)
         self.joints = {
                 Joint.Waist: ( Waist(self.controller), ), # tuple of 1 servo (IMPORTANT: comma at the end)
                 Joint.Shoulder: ( Shoulder(self.controller), ),
@@ -140,6 +153,19 @@ class MuJoCoReactorX200(ManipulatorArm):
                 Joint.Gripper: ( LeftFinger(self.controller), RightFinger(self.controller) )
         }
 
+    def reset_joints_to_home(self):
+        '''
+        Resets all joints to their home positions (simulation only), without moving them.
+        While the simulation runs, the reset is applied on its next step.
+        '''
+        self.controller.reset_home()
+
+    def spin_viewer(self):
+        '''
+        Runs the simulation viewer on the calling (main) thread until the robot is closed.
+        '''
+        self.controller.spin_viewer()
+
 if __name__ == '__main__':
     robot = MuJoCoReactorX200()
 
@@ -206,16 +232,28 @@ if __name__ == '__main__':
 
         robot.disable_joints_torques()
 
-    try:
-        #test_joints(10) # test with 10 rpm
-        test_joints(5) # test with 20 rpm
+    def run_tests():
+        '''
+        Runs the joint tests and closes the robot when they finish.
+        '''
+        try:
+            #test_joints(10) # test with 10 rpm
+            test_joints(5) # test with 20 rpm
 
-    except Exception as e:
-        print(f'Error: {e}')
+        except Exception as e:
+            print(f'Error: {e}')
+
+        finally:
+            print('Simulation finished.')
+            robot.close()
+
+    # the tests run in a worker thread, the viewer needs the main thread
+    tests = threading.Thread(target=run_tests, name='Test Thread', daemon=True)
+    tests.start()
+    try:
+        robot.spin_viewer()
+        tests.join()
 
     except KeyboardInterrupt:
         print('Simulation interrupted by user.')
-
-    finally:
-        print('Simulation finished.')
         robot.close()
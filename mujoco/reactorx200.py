@@ -1,4 +1,6 @@
 from enum import Enum
+import numpy as np
+import threading
 import time
 
 from manipulatorarm import Joint
@@ -41,6 +43,15 @@ class ReactorX200:
         for robot in self.robots:
             robot.close()
 
+    def spin_viewer(self):
+        '''
+        Runs the viewer of the simulated robot on the calling (main) thread until it is closed.
+        It returns immediately when there is no simulated robot.
+        '''
+        for robot in self.robots:
+            if isinstance(robot, MuJoCoReactorX200):
+                robot.spin_viewer()
+
     def get_joints_number(self):
         return self.robots[0].get_joints_number()
 
@@ -149,12 +160,12 @@ class ReactorX200:
         '''
         return self.robots[0].get_joint_force(joint)  # first robot
 
-    def get_joints_forces(self) -> list[float]:
+    def get_joints_forces(self) -> np.ndarray:
         '''
         Gets the current torques/forces percent of all servos.
 
         Returns:
-            list: A list of current torques/forces for all joints.
+            np.ndarray: The current torques/forces for all joints.
         '''
         return self.robots[0].get_joints_forces()  # first robot
 
@@ -193,12 +204,12 @@ class ReactorX200:
         '''
         return self.robots[0].get_joint_velocity(joint)  # first robot
 
-    def get_joints_velocities(self) -> list[float]:
+    def get_joints_velocities(self) -> np.ndarray:
         '''
         Gets the current velocities of all servos in RPM.
 
         Returns:
-            list: A list of current velocities in RPM for all joints.
+            np.ndarray: The current velocities in RPM for all joints.
         '''
         return self.robots[0].get_joints_velocities()  # first robot
 
@@ -235,12 +246,12 @@ class ReactorX200:
         '''
         return self.robots[0].get_joint_position(joint)  # first robot
 
-    def get_joints_positions(self) -> list[float]:
+    def get_joints_positions(self) -> np.ndarray:
         '''
         Gets the current positions of all joints (in degrees).
 
         Returns:
-            list: A list of current positions in degrees for all joints.
+            np.ndarray: The current positions in degrees for all joints.
         '''
         return self.robots[0].get_joints_positions()  # first robot
 
@@ -338,16 +349,28 @@ if __name__ == '__main__':
 
         robot.disable_joints_torques()
 
-    try:
-        test_joints(5) # test with 5 rpm
-        # test_joints(10) # test with 20 rpm
+    def run_tests():
+        '''
+        Runs the joint tests and closes the robot when they finish.
+        '''
+        try:
+            test_joints(5) # test with 5 rpm
+            # test_joints(10) # test with 20 rpm
+
+        except Exception as e:
+            print(f'Error: {e}')
+
+        finally:
+            print('Simulation finished.')
+            robot.close()
 
-    except Exception as e:
-        print(f'Error: {e}')
+    # the tests run in a worker thread, the viewer needs the main thread
+    tests = threading.Thread(target=run_tests, name='Test Thread', daemon=True)
+    tests.start()
+    try:
+        robot.spin_viewer()
+        tests.join()
 
     except KeyboardInterrupt:
         print('Simulation interrupted by user.')
-
-    finally:
-        print('Simulation finished.')
         robot.close()
\ No newline at end of file
@@ -205,6 +205,18 @@ class Servo:
             float: The current force in percentage.
         '''
         force = self.controller.get_force(self.servo_id)
+        return self.to_app_force(force)
+
+    def to_app_force(self, force: float) -> float:
+        '''
+        Converts a force in system units to percentage.
+
+        Parameters:
+            force (float): Force in system units.
+
+        Returns:
+            float: The force in percentage.
+        '''
         return self.force.to_app_units(force)
 
     def set_velocity(self, velocity: float):
@@ -228,20 +240,44 @@ class Servo:
             float: The current velocity in RPM.
         '''
         velocity = self.controller.get_velocity(self.servo_id)
+        return self.to_app_velocity(velocity)
+
+    def to_app_velocity(self, velocity: float) -> float:
+        '''
+        Converts a velocity in system units to RPM.
+
+        Parameters:
+            velocity (float): Velocity in system units.
+
+        Returns:
+            float: The velocity in RPM.
+        '''
         return self.velocity.to_app_units(velocity)
 
-    def set_position(self, position: float):
+    def to_sys_position(self, position: float) -> float:
         '''
-        Sets the target position of a specific joint (in degrees).
+        Converts a target position in degrees to system units, checking the position limits.
 
         Parameters:
             position (float): Target position in degrees.
+
+        Returns:
+            float: The target position in system units.
         '''
         if not self.valid_position(position):
             raise ValueError(f'Position ({position}) out of range [{self.position_limits}] for servo {self.servo_id}')
 
         factor = -1 if self.reverse_mode else 1
-        self.controller.set_position(self.servo_id, self.position.to_sys_units(factor * position))
+        return self.position.to_sys_units(factor * position)
+
+    def set_position(self, position: float):
+        '''
+        Sets the target position of a specific joint (in degrees).
+
+        Parameters:
+            position (float): Target position in degrees.
+        '''
+        self.controller.set_position(self.servo_id, self.to_sys_position(position))
 
     def get_position(self) -> float:
         '''
@@ -251,5 +287,17 @@ class Servo:
             float: The current position of the joint in degrees.
         '''
         position = self.controller.get_position(self.servo_id)  # servo units
+        return self.to_app_position(position)
+
+    def to_app_position(self, position: float) -> float:
+        '''
+        Converts a position in system units to degrees.
+
+        Parameters:
+            position (float): Position in system units.
+
+        Returns:
+            float: The position in degrees.
+        '''
         factor = -1 if self.reverse_mode else 1
         return factor * self.position.to_app_units(position)
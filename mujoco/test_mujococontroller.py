@@ -0,0 +1,121 @@
+import itertools
+import threading
+import unittest
+from collections import deque
+from types import SimpleNamespace
+
+import numpy as np
+
+from mujococontroller import MuJoCoController
+
+class TestUpdateTargets(unittest.TestCase):
+    '''
+    Tests the waypoint handling of MuJoCoController._update_targets without loading a MuJoCo model.
+    '''
+    def setUp(self):
+        self.controller = MuJoCoController.__new__(MuJoCoController) # no model loaded, no simulation thread
+        vars(self.controller).update(
+            model=SimpleNamespace(nu=1),
+            data=SimpleNamespace(time=0.0, qpos=np.ones(1), qvel=np.ones(1), ctrl=np.ones(1)),
+            running=threading.Event(),
+            torque_enabled=[True],
+            latency_budget=0.0,
+            target_position=np.zeros(1),
+            target_queue=[deque(maxlen=MuJoCoController.MAX_WAYPOINTS)],
+            _command_seq=itertools.count(),
+            _waypoints=[[]],
+            _last_waypoint=[None],
+            _target_seq=[-1],
+            _home_requested=threading.Event(),
+            _home_seq=-1,
+            _home_qpos=np.zeros(1),
+            _home_qvel=np.zeros(1),
+            _home_ctrl=np.zeros(1)
+        )
+        self.controller.running.set() # resets are deferred to the next step
+
+    def _command(self, position: float, when: float=None):
+        '''
+        Queues a position command with MuJoCoController.set_position.
+        '''
+        self.controller.set_position(0, position, when)
+
+    def _target_at(self, time: float) -> float:
+        '''
+        Runs _update_targets at the given simulation time and returns the target position.
+        '''
+        self.controller.data.time = time
+        self.controller._update_targets()
+        return self.controller.target_position[0]
+
+    def test_untimed_command_is_applied_on_next_step(self):
+        self._command(1.0)
+        self.assertEqual(self._target_at(0.0), 1.0)
+        self.assertEqual(self.controller._waypoints[0], [])
+
+    def test_interpolates_towards_next_waypoint(self):
+        self._command(10.0, when=1.0)
+        self._command(20.0, when=2.0)
+        self.assertAlmostEqual(self._target_at(0.0), 0.0)
+        self.assertAlmostEqual(self._target_at(0.5), 5.0)
+        self.assertAlmostEqual(self._target_at(1.0), 10.0)
+        self.assertAlmostEqual(self._target_at(1.5), 15.0)
+        self.assertAlmostEqual(self._target_at(2.0), 20.0)
+        self.assertAlmostEqual(self._target_at(3.0), 20.0)
+
+    def test_timed_commands_are_sorted_by_deadline(self):
+        self._command(20.0, when=2.0)
+        self._command(10.0, when=1.0)
+        self.assertAlmostEqual(self._target_at(1.0), 10.0)
+        self.assertAlmostEqual(self._target_at(2.0), 20.0)
+
+    def test_untimed_command_is_inserted_by_deadline(self):
+        self._command(1.0, when=5.0)
+        self._target_at(1.0)
+        self.controller.data.time = 2.0
+        self._command(-1.0)
+        self.assertEqual(self._target_at(2.0), -1.0)
+        self.assertAlmostEqual(self._target_at(3.5), 0.0)
+        self.assertEqual(self._target_at(5.0), 1.0)
+
+    def test_latest_command_wins_with_same_deadline(self):
+        self._command(2.0)
+        self._command(1.0)
+        self.assertEqual(self._target_at(0.0), 1.0)
+
+    def test_latency_budget_delays_untimed_commands(self):
+        self.controller.latency_budget = 1.0
+        self._command(10.0)
+        self.assertAlmostEqual(self._target_at(0.0), 0.0)
+        self.assertAlmostEqual(self._target_at(0.5), 5.0)
+        self.assertAlmostEqual(self._target_at(1.0), 10.0)
+
+    def test_waypoints_are_bounded(self):
+        for index in range(2 * MuJoCoController.MAX_WAYPOINTS):
+            self._command(float(index), when=1.0 + index)
+        self._target_at(0.0)
+        self.assertEqual(len(self.controller._waypoints[0]), MuJoCoController.MAX_WAYPOINTS)
+
+    def test_reset_home_drops_previous_commands(self):
+        self._command(1.0, when=5.0)
+        self.controller.reset_home()
+        self._command(2.0, when=5.0)
+        self.assertEqual(self._target_at(5.0), 2.0)
+
+    def test_command_after_reset_home_survives_the_reset(self):
+        self._command(1.0)
+        self.controller.reset_home()
+        self._command(2.0)
+        self.assertEqual(self._target_at(0.0), 2.0)
+        self.assertEqual(self.controller.data.qpos[0], 0.0)
+
+    def test_command_drained_before_the_reset_survives_it(self):
+        self.controller.reset_home()
+        self._command(2.0)
+        self.controller._home_requested.clear() # the step drains the command before seeing the request
+        self._target_at(0.0)
+        self.controller._home_requested.set()
+        self.assertEqual(self._target_at(0.0), 2.0)
+
+if __name__ == '__main__':
+    unittest.main()